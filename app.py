@@ -1,181 +1,243 @@
-# from fastapi import FastAPI
-# from mcp.server.sse import SseServerTransport
-# from mcp.server.fastmcp import FastMCP
-# from starlette.applications import Starlette
-# from starlette.routing import Mount, Route
-# import uvicorn
-# from mcp_image import mcp  # Import the FastMCP instance from mcp_image
-
-# #Defining some end points to test
-# from fastapi.middleware.cors import CORSMiddleware
-
-# app = FastAPI(title="Image MCP Server API")
-
- 
-# app.add_middleware(
-#     CORSMiddleware,
-#     allow_origins=["*"],  # or ["https://claude.ai"]
-#     allow_methods=["*"],
-#     allow_headers=["*"],
-# )
-
-# @app.get("/mcp/manifest.json")
-# async def manifest():
-#     return {
-#         "name": "image-mcp-server",
-#         "description": "Provides image search, upload, and download tools",
-#         "version": "1.0.0",
-#         "tools": [
-#             {"name": "search_google_images", "description": "Search for images on Google"},
-#             {"name": "save_images_to_azure", "description": "Save found images to Azure Blob Storage"},
-#             {"name": "upload_single_image_to_azure", "description": "Upload a single image to Azure Blob Storage"},
-#             {"name": "download_image_from_azure", "description": "Download an image from Azure Blob Storage"}
-#         ],
-#         "auth": {"type": "none"},
-#         "endpoints": {
-#             "sse": "https://image-mcp-server-fhf0bzdxdnced7fj.australiaeast-01.azurewebsites.net/mcp/sse/"
-#         }
-#     }
-
-
-# @app.get("/")
-# async def root():
-#     return {"message": "Image MCP Server is running", "tools": ["search_google_images", "save_images_to_azure", "upload_single_image_to_azure", "download_image_from_azure"]}   
-
-# @app.get("/health")
-# async def health():
-#     return {"status": "ok"} 
-
-
-
-# ##############################################
-
-# # Using the mcp instance from mcp_image.py which contains all the image tools
-
-
-# def create_sse_server(mcp: FastMCP):
-#     """Create a Starlette app that handles SSE connections and message handling"""
-#     transport = SseServerTransport("/messages/")
-
-#     # Define handler functions
-#     async def handle_sse(request):
-#         async with transport.connect_sse(
-#             request.scope, request.receive, request._send
-#         ) as streams:
-#             await mcp._mcp_server.run(
-#                 streams[0], streams[1], mcp._mcp_server.create_initialization_options()
-#             )
-
-#     # Create Starlette routes for SSE and message handling
-#     routes = [
-#         Route("/sse/", endpoint=handle_sse),
-#         Mount("/messages/", app=transport.handle_post_message),
-#     ]
-
-#     # Create a Starlette app
-#     return Starlette(routes=routes)
-
-
-# app.mount("/", create_sse_server(mcp))
-
-# ###########################################################################
-
-# # Image tools are defined in mcp_image.py and include:
-# # - search_google_images: Search for images on Google Images
-# # - save_images_to_azure: Save found images to Azure Blob Storage  
-# # - upload_single_image_to_azure: Upload a single image to Azure
-# # - download_image_from_azure: Download an image from Azure Blob Storage
-
-
-# # For local testing and Azure deployment
-# if __name__ == "__main__":   
-#     # Use 0.0.0.0 for Azure deployment, port from environment variable or default to 8000
-#     import os
-#     port = int(os.environ.get("PORT", 8000))
-#     uvicorn.run(app, host="0.0.0.0", port=port)
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from mcp.server.sse import SseServerTransport
+import asyncio
+import hashlib
+import orjson
 import uvicorn
 import os
 
-# Import your MCP instance
-try:
-    from mcp_image import mcp
-except ImportError:
-    # Fallback if mcp_image import fails
-    mcp = None
-    print("Warning: Could not import mcp_image module")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import the MCP instance (and Azure/Selenium with it) only when the server
+    # actually starts, so health probes and reload scans don't pay for it
+    try:
+        import mcp_image
+    except ImportError:
+        # Fallback if mcp_image import fails
+        mcp_image = None
+        print("Warning: Could not import mcp_image module")
+
+    app.state.mcp = mcp_image.mcp if mcp_image else None
+    try:
+        yield
+    finally:
+        # Tools share mcp_image's pooled HTTP client and Azure clients; close them with the worker
+        if mcp_image is not None:
+            await mcp_image.close_http_client()
+            await mcp_image.close_azure_clients()
 
-app = FastAPI(title="Image MCP Server API")
+app = FastAPI(title="Image MCP Server API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
-# Add CORS middleware
+# Add CORS middleware: only the origins, methods and headers MCP clients use,
+# with preflight results cached by the browser for 24h
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=os.environ.get("CORS_ALLOW_ORIGINS", "https://claude.ai").split(","),
+    allow_origin_regex=r"https://.*\.anthropic\.com",
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type", "authorization", "mcp-session-id", "last-event-id"],
+    max_age=86400,
 )
 
-@app.get("/")
-async def root():
-    return {
-        "message": "Image MCP Server is running", 
-        "status": "healthy",
-        "tools": ["search_google_images", "save_images_to_azure", "upload_single_image_to_azure", "download_image_from_azure"]
+# These payloads never change, so encode them once instead of on every request
+_ROOT_BYTES = orjson.dumps({
+    "message": "Image MCP Server is running",
+    "status": "healthy",
+    "tools": ["search_google_images", "save_images_to_azure", "upload_single_image_to_azure", "upload_images_to_azure", "download_image_from_azure"]
+})
+
+_MANIFEST_BYTES = orjson.dumps({
+    "name": "image-mcp-server",
+    "description": "Provides image search, upload, and download tools",
+    "version": "1.0.0",
+    "tools": [
+        {"name": "search_google_images", "description": "Search for images on Google"},
+        {"name": "save_images_to_azure", "description": "Save found images to Azure Blob Storage"},
+        {"name": "upload_single_image_to_azure", "description": "Upload a single image to Azure Blob Storage"},
+        {"name": "upload_images_to_azure", "description": "Upload several images to Azure Blob Storage in one call"},
+        {"name": "download_image_from_azure", "description": "Download an image from Azure Blob Storage"}
+    ],
+    "auth": {"type": "none"},
+    "endpoints": {
+        "sse": "https://image-mcp-server-fhf0bzdxdnced7fj.australiaeast-01.azurewebsites.net/mcp/sse"
     }
+})
 
-@app.get("/health")
-async def health():
-    return {"status": "ok", "service": "image-mcp-server"}
-
-@app.get("/mcp/manifest.json")
-async def manifest():
-    return {
-        "name": "image-mcp-server",
-        "description": "Provides image search, upload, and download tools",
-        "version": "1.0.0",
-        "tools": [
-            {"name": "search_google_images", "description": "Search for images on Google"},
-            {"name": "save_images_to_azure", "description": "Save found images to Azure Blob Storage"},
-            {"name": "upload_single_image_to_azure", "description": "Upload a single image to Azure Blob Storage"},
-            {"name": "download_image_from_azure", "description": "Download an image from Azure Blob Storage"}
-        ],
-        "auth": {"type": "none"},
-        "endpoints": {
-            "sse": "https://image-mcp-server-fhf0bzdxdnced7fj.australiaeast-01.azurewebsites.net/mcp/sse"
-        }
-    }
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+_ROOT_ETAG = _etag(_ROOT_BYTES)
+_MANIFEST_ETAG = _etag(_MANIFEST_BYTES)
 
-# Only set up MCP SSE if the mcp module loaded successfully
-if mcp is not None:
-    # Create SSE transport
-    sse_transport = SseServerTransport("/mcp/messages/")
+def _cacheable_json(request: Request, body: bytes, etag: str) -> Response:
+    """Return a static JSON body, or 304 if the client already has this version."""
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
-    @app.get("/mcp/sse")
-    async def handle_mcp_sse(request: Request):
-        """Handle SSE connections for MCP communication"""
+@app.get("/", response_class=Response)
+async def root(request: Request):
+    return _cacheable_json(request, _ROOT_BYTES, _ROOT_ETAG)
+
+@app.get("/health", response_class=Response)
+async def health():
+    body = orjson.dumps({
+        "status": "ok",
+        "service": "image-mcp-server",
+        "sse_stalled_sessions": sse_stalled_sessions,
+    })
+    return Response(body, media_type="application/json")
+
+@app.get("/mcp/manifest.json", response_class=Response)
+async def manifest(request: Request):
+    return _cacheable_json(request, _MANIFEST_BYTES, _MANIFEST_ETAG)
+
+# SSE write coalescing: batch small event frames into one socket write
+SSE_FLUSH_BYTES = int(os.environ.get("SSE_FLUSH_BYTES", 8192))
+SSE_FLUSH_MS = float(os.environ.get("SSE_FLUSH_MS", 5))
+
+class CoalescingSend:
+    """
+    ASGI send wrapper that buffers streamed response chunks and flushes them
+    once SSE_FLUSH_BYTES have accumulated or SSE_FLUSH_MS have elapsed.
+    Event order is preserved; the final body chunk is always flushed immediately.
+    """
+
+    def __init__(self, send, flush_bytes: int = SSE_FLUSH_BYTES, flush_ms: float = SSE_FLUSH_MS):
+        self._send = send
+        self._flush_bytes = flush_bytes
+        self._flush_delay = flush_ms / 1000
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
+        self._timer = None
+
+    async def __call__(self, message):
+        async with self._lock:
+            if message["type"] != "http.response.body":
+                await self._flush()
+                await self._send(message)
+                return
+
+            self._buffer += message.get("body", b"")
+            if not message.get("more_body", False):
+                self._cancel_timer()
+                body = bytes(self._buffer)
+                self._buffer.clear()
+                await self._send({"type": "http.response.body", "body": body, "more_body": False})
+            elif len(self._buffer) >= self._flush_bytes or self._flush_delay <= 0:
+                await self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self._flush_delay)
+        async with self._lock:
+            self._timer = None
+            try:
+                await self._flush()
+            except Exception as e:
+                # Client went away; the SSE response notices via receive()
+                print(f"SSE flush error: {e}")
+
+    async def _flush(self):
+        self._cancel_timer()
+        if self._buffer:
+            body = bytes(self._buffer)
+            self._buffer.clear()
+            await self._send({"type": "http.response.body", "body": body, "more_body": True})
+
+    def _cancel_timer(self):
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+
+    def close(self):
+        """Drop any pending flush when the connection is torn down."""
+        self._cancel_timer()
+        self._buffer.clear()
+
+# Give up on SSE clients that stop reading instead of parking the session forever
+SSE_SEND_TIMEOUT = float(os.environ.get("SSE_SEND_TIMEOUT", 30))
+# SSE sessions closed because the client stopped reading; reported by /health
+sse_stalled_sessions = 0
+
+class BoundedSendStream:
+    """
+    Wraps the MCP server's outgoing stream with a send timeout.
+    The transport streams are unbuffered, so a slow client blocks the producer;
+    after SSE_SEND_TIMEOUT seconds the stream is closed and the session ends.
+    """
+
+    def __init__(self, stream, timeout: float = SSE_SEND_TIMEOUT):
+        self._stream = stream
+        self._timeout = timeout
+
+    async def send(self, item):
+        global sse_stalled_sessions
         try:
-            async with sse_transport.connect_sse(request.scope, request.receive, request._send) as streams:
-                await mcp._mcp_server.run(
-                    streams[0], streams[1], mcp._mcp_server.create_initialization_options()
-                )
-            return Response()
-        except Exception as e:
-            print(f"SSE handler error: {e}")
-            return Response(status_code=500)
-
-    # Mount the message handler
+            await asyncio.wait_for(self._stream.send(item), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            sse_stalled_sessions += 1
+            print(f"SSE client stalled for {self._timeout}s, closing stream ({sse_stalled_sessions} stalled sessions so far)")
+            await self._stream.aclose()
+            raise
+
+    async def __aenter__(self):
+        await self._stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self._stream.__aexit__(*exc_info)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+# Create SSE transport
+sse_transport = SseServerTransport("/mcp/messages/")
+
+@app.get("/mcp/sse")
+async def handle_mcp_sse(request: Request):
+    """Handle SSE connections for MCP communication"""
+    mcp = request.app.state.mcp
+    if mcp is None:
+        return {"error": "MCP module not available"}
+
+    send = CoalescingSend(request._send)
     try:
-        app.mount("/mcp/messages/", sse_transport.handle_post_message)
+        async with sse_transport.connect_sse(request.scope, request.receive, send) as streams:
+            await mcp._mcp_server.run(
+                streams[0], BoundedSendStream(streams[1]), mcp._mcp_server.create_initialization_options()
+            )
+        return Response()
     except Exception as e:
-        print(f"Failed to mount message handler: {e}")
-else:
-    @app.get("/mcp/sse")
-    async def handle_mcp_sse_fallback():
-        return {"error": "MCP module not available"}
+        print(f"SSE handler error: {e}")
+        return Response(status_code=500)
+    finally:
+        send.close()
+
+# Mount the message handler
+try:
+    app.mount("/mcp/messages/", sse_transport.handle_post_message)
+except Exception as e:
+    print(f"Failed to mount message handler: {e}")
 
 # For Azure App Service deployment
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
\ No newline at end of file
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    keep_alive = int(os.environ.get("KEEP_ALIVE_TIMEOUT", 75))
+    # uvloop + httptools come with uvicorn[standard]; multiple workers need an import string
+    uvicorn.run(
+        app if workers == 1 else "app:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        timeout_keep_alive=keep_alive,
+        log_level="warning",
+    )
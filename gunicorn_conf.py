@@ -0,0 +1,18 @@
+# Gunicorn settings for Azure App Service:
+#   gunicorn -c gunicorn_conf.py app:app
+# `python app.py` / uvicorn remain the local-development entry points.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+# app.py is an ASGI app, so run it on uvicorn workers (uvloop + httptools) from the
+# uvicorn-worker package; uvicorn.workers is deprecated
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# MCP SSE sessions live in worker memory and the follow-up POSTs to
+# /mcp/messages/ must reach the same process, so default to one worker
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+keepalive = int(os.environ.get("KEEP_ALIVE_TIMEOUT", 75))
+timeout = 120
+graceful_timeout = 30
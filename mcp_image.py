@@ -3,15 +3,21 @@
 import os
 import sys
 import asyncio
+import atexit
+import hashlib
 import httpx
 import logging
 import re
+import sqlite3
+import threading
 import time
 import json
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, quote, unquote
 from mcp.server.fastmcp import FastMCP, Context
-from typing import List, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -35,12 +41,76 @@ ROYALTY_FREE_DOMAINS = [
     "pexels.com", "unsplash.com", "pixabay.com", "freepik.com", "stock.adobe.com"
 ]
 
-def is_royalty_free_url(url: str) -> bool:
-    parsed = urlparse(url)
-    return any(domain in parsed.netloc for domain in ROYALTY_FREE_DOMAINS)
+_ROYALTY_FREE_HOSTS = frozenset(ROYALTY_FREE_DOMAINS)
+
+def _is_royalty_free_host(host: Optional[str]) -> bool:
+    """True if host is one of the domains above or a subdomain of one (hostname is already lowercase)."""
+    host = (host or "").rstrip(".")
+    while host:
+        if host in _ROYALTY_FREE_HOSTS:
+            return True
+        host = host.partition(".")[2]
+    return False
+
+# Bare image URLs (direct image URLs, then URLs mentioning an image extension)
+_BARE_IMG_URL_PATTERN = (
+    r'https?://[^"\s,]+\.(?:jpg|jpeg|png|gif|webp)(?:[^"\s,]*)?'
+    r'|https?://[^"\s,]*(?:jpg|jpeg|png|gif|webp)[^"\s,]*'
+)
+_BARE_IMG_URL_RE = re.compile(_BARE_IMG_URL_PATTERN, re.IGNORECASE)
+
+# Image URLs in Google Images HTML, as one alternation so the page is scanned once
+_IMG_URL_RE = re.compile(
+    r'"ou":"([^"]*)"'  # Original URL pattern
+    r'|"data-src":"([^"]*)"'  # Data source pattern
+    r'|"src":"([^"]*)"'  # Source pattern
+    r'|(' + _BARE_IMG_URL_PATTERN + r')',  # Bare image URLs
+    re.IGNORECASE
+)
+
+def _iter_image_url_matches(html: str):
+    """
+    Yield raw candidate URL strings from a results page.
+    A quoted value that isn't itself a URL (e.g. "/imgres?imgurl=https://...") is
+    rescanned for bare URLs, since the fused alternation consumes it as a whole.
+    """
+    for m in _IMG_URL_RE.finditer(html):
+        match = m.group(m.lastindex)
+        if m.lastindex <= 3 and not match.startswith('http'):
+            for nested in _BARE_IMG_URL_RE.finditer(match):
+                yield nested.group(0)
+        else:
+            yield match
+
+# JSON escapes Google leaves in embedded URLs, undone in one pass
+_UNESCAPE_MAP = {'\\u003d': '=', '\\u0026': '&', '\\/': '/'}
+_UNESCAPE_RE = re.compile(r'\\u003d|\\u0026|\\/')
+
+def _unescape(m: re.Match) -> str:
+    return _UNESCAPE_MAP[m.group(0)]
+
+# Extensions kept when naming blobs; anything else is stored as .png
+_ALLOWED_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'webp'})
+
+# Keep-check for image extensions and skip-check for unwanted domains/assets
+_IMG_EXT_RE = re.compile(r'\.(?:jpe?g|png|gif|webp)', re.IGNORECASE)
+_SKIP_URL_RE = re.compile(
+    r'gstatic\.com|ggpht\.com|googleusercontent\.com|encrypted-tbn'
+    r'|logo|icon|avatar|profile|thumbnail',
+    re.IGNORECASE
+)
+
+# HTTP/2 needs the h2 package (httpx[http2]); without it the shared client stays on HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Azure Blob Storage imports
+from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
 
 TEMP_DIR = "./Temp"
 DATA_DIR = "./data"
@@ -48,6 +118,13 @@ DATA_DIR = "./data"
 # Azure Blob Storage configuration (same as test.py)
 AZURE_CONNECTION_STRING = os.getenv('AZURE_CONNECTION_STRING')
 CONTAINER_NAME = "image-mcp"
+# Parallel block transfers per blob upload/download
+AZURE_MAX_CONCURRENCY = int(os.getenv('AZURE_MAX_CONCURRENCY', '8'))
+# Uploads up to this size go in one PUT; larger ones are split into blocks sent in parallel
+AZURE_SINGLE_PUT_SIZE = 8 * 1024 * 1024
+AZURE_MAX_BLOCK_SIZE = 4 * 1024 * 1024
+# Sources fetched/uploaded at once by save_images_to_azure
+MAX_PARALLEL_SAVES = 8
 
 # Ensure directories exist
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -71,20 +148,266 @@ logger.propagate = False
 # Create a FastMCP server instance
 mcp = FastMCP("image-service")
 
+# Browser-like headers for fetching Google Images result pages
+_SEARCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Shared HTTP client so keep-alive connections and TLS sessions survive across tool calls
+_http_client = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide httpx client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=75),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+    return _http_client
+
+async def close_http_client():
+    """Close the shared httpx client (called on server shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+# Results pages that came with validators, so repeat searches can revalidate with a conditional GET
+SERP_CACHE_PATH = os.path.join(DATA_DIR, "serp_cache.sqlite3")
+SERP_CACHE_TTL = 24 * 60 * 60  # seconds
+SERP_CACHE_MAX_ROWS = 256
+_serp_db = None
+_serp_db_lock = threading.Lock()
+
+def _serp_cache_conn() -> sqlite3.Connection:
+    global _serp_db
+    if _serp_db is None:
+        # Short busy timeout: when another worker holds the lock, skipping the cache beats waiting
+        conn = sqlite3.connect(SERP_CACHE_PATH, timeout=1.0, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS serp_cache "
+            "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, html TEXT, fetched_at REAL)"
+        )
+        _serp_db = conn
+    return _serp_db
+
+def _serp_cache_get(url: str) -> Optional[tuple]:
+    """Return (etag, last_modified, html) for a cached results page younger than SERP_CACHE_TTL, or None."""
+    with _serp_db_lock:
+        return _serp_cache_conn().execute(
+            "SELECT etag, last_modified, html FROM serp_cache WHERE url = ? AND fetched_at >= ?",
+            (url, time.time() - SERP_CACHE_TTL)
+        ).fetchone()
+
+def _serp_cache_put(url: str, etag: Optional[str], last_modified: Optional[str], html: str):
+    """Store a results page, pruning expired rows and keeping at most SERP_CACHE_MAX_ROWS."""
+    now = time.time()
+    with _serp_db_lock:
+        conn = _serp_cache_conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO serp_cache (url, etag, last_modified, html, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, html, now)
+            )
+            conn.execute("DELETE FROM serp_cache WHERE fetched_at < ?", (now - SERP_CACHE_TTL,))
+            conn.execute(
+                "DELETE FROM serp_cache WHERE url NOT IN "
+                "(SELECT url FROM serp_cache ORDER BY fetched_at DESC LIMIT ?)",
+                (SERP_CACHE_MAX_ROWS,)
+            )
+
+async def _fetch_results_page(client: httpx.AsyncClient, search_url: str) -> str:
+    """
+    GET a results page, reusing the cached copy when the server answers 304 Not Modified.
+    The cache is best effort: if SQLite fails, this degrades to a plain GET.
+    """
+    headers = _SEARCH_HEADERS
+    try:
+        cached = await asyncio.to_thread(_serp_cache_get, search_url)
+    except sqlite3.Error as e:
+        logger.debug(f"Results page cache unavailable, fetching without it: {str(e)}")
+        cached = None
+    if cached is not None:
+        etag, last_modified, _ = cached
+        headers = dict(_SEARCH_HEADERS)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    response = await client.get(search_url, headers=headers, follow_redirects=True)
+    if response.status_code == 304 and cached is not None:
+        logger.debug(f"Results page not modified, using cached copy: {search_url}")
+        return cached[2]
+    response.raise_for_status()
+
+    # Only pages with validators are worth keeping; without them we can't revalidate
+    etag = response.headers.get('etag')
+    last_modified = response.headers.get('last-modified')
+    if etag or last_modified:
+        try:
+            await asyncio.to_thread(_serp_cache_put, search_url, etag, last_modified, response.text)
+        except sqlite3.Error as e:
+            logger.debug(f"Could not cache results page {search_url}: {str(e)}")
+    return response.text
+
+# Candidate image URLs probed at once per search
+MAX_CONCURRENT_PROBES = 20
+
+# Hosts whose image URLs recently failed validation, keyed by netloc -> time.monotonic()
+_DOMAIN_FAIL_CACHE: Dict[str, float] = {}
+DOMAIN_FAIL_TTL = 300  # seconds
+
+def _purge_domain_failures():
+    """Drop failed-host entries older than DOMAIN_FAIL_TTL."""
+    cutoff = time.monotonic() - DOMAIN_FAIL_TTL
+    for netloc in [n for n, failed_at in _DOMAIN_FAIL_CACHE.items() if failed_at < cutoff]:
+        del _DOMAIN_FAIL_CACHE[netloc]
+
+# Leading bytes of the image formats we accept; content-type headers from CDNs are unreliable
+_MAGIC = (
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n", "png"),
+    (b"GIF8", "gif"),
+)
+
+def _sniff_image_type(prefix: bytes) -> Optional[str]:
+    """Return the image format implied by a body prefix, or None if it isn't one we accept."""
+    for magic, image_type in _MAGIC:
+        if prefix.startswith(magic):
+            return image_type
+    if prefix[:4] == b"RIFF" and prefix[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+async def _read_prefix(chunks, size: int = 16) -> bytes:
+    """Pull chunks from a byte stream until at least `size` bytes (or the whole body) are read."""
+    prefix = b""
+    async for chunk in chunks:
+        prefix += chunk
+        if len(prefix) >= size:
+            break
+    return prefix
+
+async def _probe_image_type(client: httpx.AsyncClient, url: str) -> Optional[str]:
+    """
+    Fetch only the first KB of a URL and sniff it.
+    Returns the image format, "" if the body isn't an image, or None for a non-2xx response.
+    """
+    async with client.stream("GET", url, headers={"Range": "bytes=0-1023"}, timeout=10.0) as response:
+        if response.status_code not in (200, 206):
+            return None
+        # Servers that ignore Range send the whole body; stop reading after the prefix
+        return _sniff_image_type(await _read_prefix(response.aiter_bytes())) or ""
+
+# Recent successful searches, keyed by (normalised query, max_results) -> (time.monotonic(), results)
+_SEARCH_CACHE = OrderedDict()
+SEARCH_CACHE_TTL = 600  # seconds
+SEARCH_CACHE_MAX_ENTRIES = 128
+
+# Selenium selectors for result thumbnails and the full-size preview image
+_THUMBNAIL_SELECTOR = "img[data-src], img[src*='gstatic'], div[data-tbnid] img"
+_LARGE_IMAGE_SELECTORS = [
+    "img.n3VNCb",  # Common class for large images
+    "img.iPVvYb",
+    "img[src*='http']:not([src*='gstatic']):not([src*='encrypted'])",
+    "div[data-tbnid] img[src*='http']",
+]
+# Resolves the preview image as the first element matching a selector in the given
+# list, in list order. Shared by every preview script so the wait and the read
+# always look at the same element.
+_FIND_PREVIEW_JS = """
+function findPreview(selectors) {
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        if (el) return el;
+    }
+    return null;
+}
+"""
+# Clicks the thumbnail in arguments[0] and returns the preview src shown just before the click
+_CLICK_THUMBNAIL_JS = _FIND_PREVIEW_JS + """
+const preview = findPreview(arguments[1]);
+const previous = preview ? preview.src : null;
+arguments[0].click();
+return previous;
+"""
+# Current preview src, for the post-click wait
+_PREVIEW_SRC_JS = _FIND_PREVIEW_JS + """
+const preview = findPreview(arguments[0]);
+return preview ? preview.src : null;
+"""
+# Reads everything needed from the open preview in one WebDriver call: the preview
+# src, the clicked thumbnail's alt text (arguments[1]) and the source page link
+_PREVIEW_DETAILS_JS = _FIND_PREVIEW_JS + """
+const preview = findPreview(arguments[0]);
+const sourceLink = document.querySelector("div.fxgdke a");
+return {
+    src: preview ? preview.src : null,
+    alt: arguments[1].alt,
+    href: sourceLink ? sourceLink.href : null,
+};
+"""
+
+def _preview_image_changed(previous_src: Optional[str]):
+    """WebDriver condition factory: the preview shows a full-size image with a real URL other than previous_src."""
+    def condition(driver) -> bool:
+        src = driver.execute_script(_PREVIEW_SRC_JS, _LARGE_IMAGE_SELECTORS) or ""
+        return src.startswith("http") and src != previous_src
+    return condition
+
+def _page_grew_beyond(height: int):
+    """WebDriver condition factory: the page has loaded content past the given scroll height."""
+    return lambda driver: driver.execute_script("return document.body.scrollHeight") > height
+
 class GoogleImageSearcher:
     """
     Google Images searcher that extracts direct image URLs.
     Uses Selenium when available, falls back to simpler HTTP method.
     """
     
+    # One Chrome instance per process, reused across searches. WebDriver is not
+    # thread-safe, so a search holds the lock for its whole duration. Async callers
+    # go through a dedicated single-thread executor, so queued searches wait in its
+    # queue instead of parking threads from the loop's shared default executor.
+    _shared_driver = None
+    _driver_lock = threading.Lock()
+    _driver_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selenium")
+    
     def __init__(self, headless=True):
         self.headless = headless
         self.driver = None
         
+    @classmethod
+    def _quit_shared_driver(cls):
+        """Quit the shared Chrome instance, if any."""
+        if cls._shared_driver is not None:
+            try:
+                cls._shared_driver.quit()
+            except Exception:
+                pass
+            cls._shared_driver = None
+        
     def _setup_driver(self):
-        """Setup Chrome WebDriver with appropriate options."""
+        """Setup Chrome WebDriver with appropriate options, reusing a live shared driver."""
         if not SELENIUM_AVAILABLE:
             return False
+        
+        cls = type(self)
+        if cls._shared_driver is not None:
+            try:
+                cls._shared_driver.current_url  # Cheap liveness check
+                self.driver = cls._shared_driver
+                return True
+            except Exception:
+                logger.warning("Shared Chrome driver is no longer responsive, starting a new one")
+                cls._quit_shared_driver()
             
         try:
             options = Options()
@@ -106,6 +429,7 @@ class GoogleImageSearcher:
                 return False
                 
             self.driver.set_window_size(1920, 1080)
+            cls._shared_driver = self.driver
             return True
             
         except Exception as e:
@@ -126,130 +450,121 @@ class GoogleImageSearcher:
                 f"https://www.google.com/search?q={encoded_query}&tbm=isch&hl=en",  # Old format
             ]
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
             html_content = None
             successful_url = None
+            client = get_http_client()
             
-            async with httpx.AsyncClient(headers=headers, timeout=30.0, follow_redirects=True) as client:
-                for search_url in search_urls:
-                    try:
-                        response = await client.get(search_url)
-                        response.raise_for_status()
-                        html_content = response.text
-                        successful_url = search_url
-                        break
-                    except Exception as e:
-                        logger.debug(f"Failed with URL {search_url}: {str(e)}")
-                        continue
-                
-                if not html_content:
-                    return [{"error": "Failed to fetch Google Images page with any URL format", "status": "failed"}]
-                
-                logger.info(f"Successfully fetched page using: {successful_url}")
-                
-                # Extract image URLs using regex patterns
-                image_results = []
-                
-                # Enhanced patterns to find image URLs in the HTML
-                patterns = [
-                    r'"ou":"([^"]*)"',  # Original URL pattern
-                    r'"data-src":"([^"]*)"',  # Data source pattern
-                    r'"src":"([^"]*)"',  # Source pattern
-                    r'https?://[^"\s,]+\.(?:jpg|jpeg|png|gif|webp)(?:[^"\s,]*)?',  # Direct image URLs
-                    r'https?://[^"\s,]*(?:jpg|jpeg|png|gif|webp)[^"\s,]*',  # Image URLs with extensions
-                ]
-                
-                found_urls = set()
-                for pattern in patterns:
-                    matches = re.findall(pattern, html_content, re.IGNORECASE)
-                    for match in matches:
-                        # Clean and validate the URL
-                        url = match.replace('\\u003d', '=').replace('\\u0026', '&').replace('\\/', '/')
-                        
-                        # Decode URL if needed
-                        try:
-                            url = unquote(url)
-                        except:
-                            pass
-                            
-                        if url.startswith('http') and any(ext in url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                            # Skip certain unwanted domains and patterns
-                            skip_patterns = [
-                                'gstatic.com', 'ggpht.com', 'googleusercontent.com', 'encrypted-tbn',
-                                'logo', 'icon', 'avatar', 'profile', 'thumbnail'
-                            ]
-                            if not any(skip in url.lower() for skip in skip_patterns):
-                                # Only include URLs that look like actual images
-                                if len(url) > 20 and len(url) < 2000:  # Reasonable URL length
-                                    found_urls.add(url)
+            for search_url in search_urls:
+                try:
+                    html_content = await _fetch_results_page(client, search_url)
+                    successful_url = search_url
+                    break
+                except Exception as e:
+                    logger.debug(f"Failed with URL {search_url}: {str(e)}")
+                    continue
+            
+            if not html_content:
+                return [{"error": "Failed to fetch Google Images page with any URL format", "status": "failed"}]
+            
+            logger.info(f"Successfully fetched page using: {successful_url}")
+            
+            # Extract image URLs using regex patterns
+            image_results = []
+            
+            # Insertion-ordered dedup keeps Google's ranking when results are capped
+            found_urls: Dict[str, None] = {}
+            # Single pass over the HTML (quoted non-URL values are rescanned for nested URLs)
+            for match in _iter_image_url_matches(html_content):
+                # Unescaping only shortens a URL, so anything this short can't pass the length check
+                if len(match) <= 20:
+                    continue
+                # Clean and validate the URL
+                url = _UNESCAPE_RE.sub(_unescape, match) if '\\' in match else match
                 
-                # Convert to list and limit results
-                unique_urls = list(found_urls)[:max_results * 3]  # Get more URLs to filter better ones
+                # Decode URL if needed
+                try:
+                    url = unquote(url)
+                except:
+                    pass
+                    
+                # Only include URLs that look like actual images, skipping
+                # Google-hosted thumbnails and logo/icon style assets
+                if (url.startswith('http') and 20 < len(url) < 2000
+                        and _IMG_EXT_RE.search(url) and not _SKIP_URL_RE.search(url)):
+                    found_urls[url] = None
+            
+            # Skip hosts that recently failed validation, then limit results
+            _purge_domain_failures()
+            # Each candidate is parsed once here; the fields are reused below
+            candidates = [(url, urlparse(url)) for url in found_urls]
+            candidates = [(url, parsed) for url, parsed in candidates if parsed.netloc not in _DOMAIN_FAIL_CACHE]
+            candidates = candidates[:max_results * 3]  # Get more URLs to filter better ones
+            
+            # Validate candidates concurrently by sniffing the first KB of each, with a cap
+            # so one search can't take over the pool shared with Azure uploads
+            probe_slots = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+
+            async def probe(url: str) -> Optional[str]:
+                async with probe_slots:
+                    return await _probe_image_type(client, url)
+
+            sniffed_types = await asyncio.gather(
+                *(probe(url) for url, _ in candidates),
+                return_exceptions=True
+            )
+            
+            # Remember hosts that errored or served non-images so later searches skip them
+            failed_at = time.monotonic()
+            for (url, parsed), image_type in zip(candidates, sniffed_types):
+                if isinstance(image_type, Exception) or image_type == "":
+                    _DOMAIN_FAIL_CACHE[parsed.netloc] = failed_at
+            
+            # Collect results in candidate order and get metadata
+            valid_results = []
+            for (url, parsed), image_type in zip(candidates, sniffed_types):
+                if len(valid_results) >= max_results:
+                    break
                 
-                # Try to validate URLs and get metadata
-                valid_results = []
-                async with httpx.AsyncClient(timeout=10.0) as test_client:
-                    for i, url in enumerate(unique_urls):
-                        if len(valid_results) >= max_results:
-                            break
-                            
-                        try:
-                            # Quick head request to validate the URL
-                            head_response = await test_client.head(url)
-                            if head_response.status_code == 200:
-                                content_type = head_response.headers.get('content-type', '')
-                                if content_type.startswith('image/'):
-                                    # Try to get some metadata by parsing the URL
-                                    parsed = urlparse(url)
-                                    domain = parsed.netloc
-                                    
-                                    # Extract filename for title
-                                    filename = os.path.basename(parsed.path)
-                                    if filename:
-                                        title = filename
-                                    else:
-                                        title = f"Image from {domain}"
-                                    
-                                    valid_results.append({
-                                        "url": url,
-                                        "title": title,
-                                        "source": f"https://{domain}",
-                                        "status": "success"
-                                    })
-                                    
-                        except Exception as e:
-                            logger.debug(f"Error validating URL {url}: {str(e)}")
-                            # If validation fails, still include the URL but mark it as unvalidated
-                            if len(valid_results) < max_results:
-                                parsed = urlparse(url)
-                                domain = parsed.netloc
-                                
-                                valid_results.append({
-                                    "url": url,
-                                    "title": f"Image from {domain} (unvalidated)",
-                                    "source": f"https://{domain}",
-                                    "status": "success"
-                                })
+                if isinstance(image_type, Exception):
+                    logger.debug(f"Error validating URL {url}: {str(image_type)}")
+                    continue
+                if not image_type:
+                    continue
                 
-                logger.info(f"Found {len(valid_results)} images using simple method for query: {query}")
-                return valid_results
+                # Title from the filename, falling back to the domain
+                domain = parsed.netloc
                 
+                valid_results.append({
+                    "url": url,
+                    "title": os.path.basename(parsed.path) or f"Image from {domain}",
+                    "source": f"https://{domain}",
+                    "status": "success"
+                })
+            
+            logger.info(f"Found {len(valid_results)} images using simple method for query: {query}")
+            return valid_results
+            
         except Exception as e:
             logger.error(f"Simple method search failed: {str(e)}")
             return [{"error": f"Simple search method failed: {str(e)}", "status": "failed"}]
     
+    def _wait_for(self, timeout: float, condition) -> bool:
+        """Wait until a WebDriver condition holds; returns False on timeout instead of raising."""
+        try:
+            WebDriverWait(self.driver, timeout).until(condition)
+            return True
+        except TimeoutException:
+            return False
+    
     def search_images_selenium(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
         Search for images using Selenium WebDriver (requires Chrome and chromedriver).
+        Blocking; async code should go through search_images, which runs it on _driver_executor.
         """
+        with self._driver_lock:
+            return self._search_images_selenium(query, max_results)
+    
+    def _search_images_selenium(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         try:
             if not self._setup_driver():
                 return [{"error": "Failed to setup Chrome driver. Please ensure Chrome and chromedriver are installed.", "status": "failed"}]
@@ -261,8 +576,8 @@ class GoogleImageSearcher:
             logger.info(f"Searching Google Images for: {query}")
             self.driver.get(search_url)
             
-            # Wait for page to load
-            time.sleep(3)
+            # Wait for the first images to render instead of a fixed delay
+            self._wait_for(5, EC.presence_of_element_located((By.CSS_SELECTOR, "img")))
             
             # Handle cookie consent if present
             try:
@@ -270,23 +585,20 @@ class GoogleImageSearcher:
                     EC.element_to_be_clickable((By.ID, "L2AGLb"))
                 )
                 consent_button.click()
-                time.sleep(1)
+                self._wait_for(3, EC.staleness_of(consent_button))
             except TimeoutException:
                 pass  # No consent dialog appeared
             
             image_results = []
+            seen_urls = set()
             count = 0
             page_height = 0
             
             while count < max_results:
                 # Find all image elements on current page
                 try:
-                    # Try multiple selectors for image elements
-                    img_elements = self.driver.find_elements(By.CSS_SELECTOR, "img[data-src]")
-                    if not img_elements:
-                        img_elements = self.driver.find_elements(By.CSS_SELECTOR, "img[src*='gstatic']")
-                    if not img_elements:
-                        img_elements = self.driver.find_elements(By.CSS_SELECTOR, "div[data-tbnid] img")
+                    # One combined selector instead of up to three lookups
+                    img_elements = self.driver.find_elements(By.CSS_SELECTOR, _THUMBNAIL_SELECTOR)
                     
                     if not img_elements:
                         logger.warning("No image elements found, trying alternative approach")
@@ -297,50 +609,31 @@ class GoogleImageSearcher:
                             break
                             
                         try:
-                            # Click on the image to get full resolution
-                            self.driver.execute_script("arguments[0].click();", img)
-                            time.sleep(2)
-                            
-                            # Get the large image from the preview panel
-                            large_img_selectors = [
-                                "img.n3VNCb",  # Common class for large images
-                                "img.iPVvYb", 
-                                "img[src*='http']:not([src*='gstatic']):not([src*='encrypted'])",
-                                "div[data-tbnid] img[src*='http']"
-                            ]
+                            # Click on the image to get full resolution, then wait until the
+                            # preview has replaced the previous result's image
+                            previous_src = self.driver.execute_script(_CLICK_THUMBNAIL_JS, img, _LARGE_IMAGE_SELECTORS)
+                            self._wait_for(3, _preview_image_changed(previous_src))
                             
-                            large_img = None
-                            for selector in large_img_selectors:
-                                try:
-                                    large_img = self.driver.find_element(By.CSS_SELECTOR, selector)
-                                    if large_img:
-                                        break
-                                except NoSuchElementException:
-                                    continue
+                            # Get the large image, title and source from the preview panel
+                            details = self.driver.execute_script(_PREVIEW_DETAILS_JS, _LARGE_IMAGE_SELECTORS, img)
+                            img_url = details.get("src")
                             
-                            if large_img:
-                                img_url = large_img.get_attribute("src")
-                                if img_url and img_url.startswith("http") and "encrypted" not in img_url and "gstatic" not in img_url:
-                                    # Get additional metadata
-                                    title = img.get_attribute("alt") or f"Image {count + 1}"
-                                    
-                                    # Try to get source website
-                                    source = "Unknown"
-                                    try:
-                                        source_elem = self.driver.find_element(By.CSS_SELECTOR, "div.fxgdke a")
-                                        source = source_elem.get_attribute("href") or "Unknown"
-                                    except NoSuchElementException:
-                                        pass
-                                    
-                                    image_results.append({
-                                        "url": img_url,
-                                        "title": title,
-                                        "source": source,
-                                        "status": "success"
-                                    })
-                                    
-                                    count += 1
-                                    logger.info(f"Found image {count}: {img_url}")
+                            if (img_url and img_url.startswith("http") and img_url not in seen_urls
+                                    and "encrypted" not in img_url and "gstatic" not in img_url):
+                                seen_urls.add(img_url)
+                                # Get additional metadata
+                                title = details.get("alt") or f"Image {count + 1}"
+                                source = details.get("href") or "Unknown"
+                                
+                                image_results.append({
+                                    "url": img_url,
+                                    "title": title,
+                                    "source": source,
+                                    "status": "success"
+                                })
+                                
+                                count += 1
+                                logger.info(f"Found image {count}: {img_url}")
                             
                         except Exception as e:
                             logger.debug(f"Error processing individual image: {str(e)}")
@@ -352,13 +645,13 @@ class GoogleImageSearcher:
                         if current_height > page_height:
                             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                             page_height = current_height
-                            time.sleep(2)
+                            self._wait_for(3, _page_grew_beyond(current_height))
                         else:
                             # Try clicking "Show more results" button
                             try:
                                 show_more = self.driver.find_element(By.CSS_SELECTOR, "input[value*='Show more']")
                                 show_more.click()
-                                time.sleep(3)
+                                self._wait_for(5, _page_grew_beyond(current_height))
                             except NoSuchElementException:
                                 break  # No more images to load
                     
@@ -377,19 +670,41 @@ class GoogleImageSearcher:
         finally:
             if self.driver:
                 try:
-                    self.driver.quit()
+                    # Leave the shared browser clean for the next search
+                    self.driver.delete_all_cookies()
+                    self.driver.get("about:blank")
                 except Exception:
-                    pass
+                    type(self)._quit_shared_driver()
                 self.driver = None
     
     async def search_images(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
         Search for images, trying Selenium first and falling back to simple method.
+        Successful results are cached for SEARCH_CACHE_TTL seconds per (query, max_results).
         """
+        key = (query.casefold().strip(), max_results)
+        now = time.monotonic()
+        hit = _SEARCH_CACHE.get(key)
+        if hit is not None and now - hit[0] < SEARCH_CACHE_TTL:
+            _SEARCH_CACHE.move_to_end(key)
+            logger.info(f"Serving cached image results for query: {query}")
+            return list(hit[1])
+        
+        results = await self._search_images_uncached(query, max_results)
+        if results and any(r.get("status") == "success" for r in results):
+            _SEARCH_CACHE[key] = (now, results)
+            _SEARCH_CACHE.move_to_end(key)
+            while len(_SEARCH_CACHE) > SEARCH_CACHE_MAX_ENTRIES:
+                _SEARCH_CACHE.popitem(last=False)
+        return list(results)
+
+    async def _search_images_uncached(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         if SELENIUM_AVAILABLE:
             # Try Selenium method first
             try:
-                results = self.search_images_selenium(query, max_results)
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._driver_executor, self.search_images_selenium, query, max_results
+                )
                 if results and any(r.get("status") == "success" for r in results):
                     return results
                 else:
@@ -400,79 +715,249 @@ class GoogleImageSearcher:
         # Fall back to simple method
         return await self._search_simple_method(query, max_results)
 
-def upload_to_azure_blob(local_file_path: str = None, file_data: bytes = None, blob_name: str = None) -> Dict[str, Any]:
+atexit.register(GoogleImageSearcher._quit_shared_driver)
+
+# Azure clients are built once and reused; the container is created on first use
+_blob_service_client = None
+_container_client = None
+_account_key = None
+_azure_client_lock = threading.Lock()
+
+def _get_container_client():
+    """Return the cached container client, creating clients and container on first call."""
+    global _blob_service_client, _container_client, _account_key
+    if _container_client is None:
+        with _azure_client_lock:
+            if _container_client is None:
+                service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
+                container_client = service_client.get_container_client(CONTAINER_NAME)
+
+                # Ensure container exists
+                try:
+                    container_client.create_container()
+                except Exception:
+                    pass  # Container already exists
+
+                _blob_service_client = service_client
+                _account_key = AZURE_CONNECTION_STRING.split("AccountKey=")[1].split(";")[0]
+                _container_client = container_client
+    return _container_client
+
+# Async SDK client used for uploads and downloads, so they don't block the event loop
+_async_blob_service_client = None
+_async_container_client = None
+
+async def _get_async_container_client():
+    """Return the cached async container client (container is ensured via the sync client)."""
+    global _async_blob_service_client, _async_container_client
+    if _async_container_client is None:
+        await asyncio.to_thread(_get_container_client)
+        if _async_container_client is None:
+            _async_blob_service_client = AsyncBlobServiceClient.from_connection_string(
+                AZURE_CONNECTION_STRING,
+                max_single_put_size=AZURE_SINGLE_PUT_SIZE,
+                max_block_size=AZURE_MAX_BLOCK_SIZE
+            )
+            _async_container_client = _async_blob_service_client.get_container_client(CONTAINER_NAME)
+    return _async_container_client
+
+async def close_azure_clients():
+    """Close the async Azure client (called on server shutdown)."""
+    global _async_blob_service_client, _async_container_client
+    if _async_blob_service_client is not None:
+        await _async_blob_service_client.close()
+        _async_blob_service_client = None
+        _async_container_client = None
+
+class _ChunkCounter:
+    """Async iterator over byte chunks that counts the bytes passed through it."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.total = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        chunk = await self._chunks.__anext__()
+        self.total += len(chunk)
+        return chunk
+
+async def _prepend_chunk(first_chunk: bytes, chunks):
+    """Yield an already-read chunk followed by the rest of the stream."""
+    if first_chunk:
+        yield first_chunk
+    async for chunk in chunks:
+        yield chunk
+
+def _open_and_read(path: str, chunk_size: int):
+    f = open(path, "rb")
+    try:
+        return f, f.read(chunk_size)
+    except BaseException:
+        f.close()
+        raise
+
+async def _iter_file(path: str, chunk_size: int = 4 * 1024 * 1024):
+    """Read a local file in chunks on a worker thread so the event loop never blocks on disk I/O."""
+    # Open and first read share one thread hop; a short first read means the
+    # file is done, so small images cost a single hop instead of three
+    f, chunk = await asyncio.to_thread(_open_and_read, path, chunk_size)
+    try:
+        while chunk:
+            yield chunk
+            if len(chunk) < chunk_size:
+                break
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+    finally:
+        f.close()
+
+def _generate_blob_url(blob_name: str) -> str:
+    """Build a read-only SAS URL for a blob that expires in 24 hours."""
+    _get_container_client()
+    account_name = _blob_service_client.account_name
+
+    sas_token = generate_blob_sas(
+        account_name=account_name,
+        container_name=CONTAINER_NAME,
+        blob_name=blob_name,
+        account_key=_account_key,
+        permission=BlobSasPermissions(read=True),
+        expiry=datetime.utcnow() + timedelta(hours=24)
+    )
+
+    return f"https://{account_name}.blob.core.windows.net/{CONTAINER_NAME}/{blob_name}?{sas_token}"
+
+async def upload_to_azure_blob(
+    local_file_path: str = None,
+    file_data: bytes = None,
+    blob_name: str = None,
+    data_stream=None,
+    length: int = None,
+    max_concurrency: int = None
+) -> Dict[str, Any]:
     """
     Upload a file to Azure Blob Storage and return a SAS URL.
-    Can accept either a file path or raw bytes data.
+    Can accept a file path, raw bytes data, or an async iterator of byte chunks.
     
     :param local_file_path: Path to the local file to upload
     :param file_data: Raw bytes data to upload (alternative to local_file_path)
     :param blob_name: Name of the blob in Azure
+    :param data_stream: Async iterator of byte chunks, e.g. a streamed HTTP body
+    :param length: Size of data_stream in bytes, if known
+    :param max_concurrency: Parallel block uploads for large blobs (defaults to AZURE_MAX_CONCURRENCY)
     :return: Dictionary with upload result
     """
     try:
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
-        container_client = blob_service_client.get_container_client(CONTAINER_NAME)
-
-        # Ensure container exists
-        try:
-            container_client.create_container()
-        except Exception:
-            pass  # Container already exists
+        container_client = await _get_async_container_client()
 
         # Get data to upload
+        counter = None
         if file_data is not None:
             data_to_upload = file_data
+            length = len(file_data)
+        elif data_stream is not None:
+            data_to_upload = counter = _ChunkCounter(data_stream)
         elif local_file_path is not None:
-            with open(local_file_path, "rb") as f:
-                data_to_upload = f.read()
+            # Stream the file in chunks rather than reading it all into memory first
+            length = await asyncio.to_thread(os.path.getsize, local_file_path)
+            data_to_upload = _iter_file(local_file_path)
         else:
-            raise ValueError("Either local_file_path or file_data must be provided")
+            raise ValueError("Either local_file_path, file_data or data_stream must be provided")
 
         # Upload
-        container_client.upload_blob(name=blob_name, data=data_to_upload, overwrite=True)
-        
-        # Generate a SAS URL that expires in 24 hours
-        account_name = blob_service_client.account_name
-        account_key = AZURE_CONNECTION_STRING.split("AccountKey=")[1].split(";")[0]
-        
-        sas_token = generate_blob_sas(
-            account_name=account_name,
-            container_name=CONTAINER_NAME,
-            blob_name=blob_name,
-            account_key=account_key,
-            permission=BlobSasPermissions(read=True),
-            expiry=datetime.utcnow() + timedelta(hours=24)
+        await container_client.upload_blob(
+            name=blob_name,
+            data=data_to_upload,
+            overwrite=True,
+            length=length,
+            max_concurrency=max_concurrency or AZURE_MAX_CONCURRENCY
         )
         
-        blob_url = f"https://{account_name}.blob.core.windows.net/{CONTAINER_NAME}/{blob_name}?{sas_token}"
-        
         logger.info(f"Successfully uploaded {blob_name} to Azure Blob Storage")
         
-        return {
-            "status": "success",
-            "filename": blob_name,
-            "blob_url": blob_url,
-            "markdown": f"![{blob_name}]({blob_url})",
-            "size_bytes": len(data_to_upload)
-        }
+        return _blob_result(blob_name, counter.total if counter is not None else length)
         
     except Exception as e:
         error_msg = f"Failed to upload to Azure Blob Storage: {str(e)}"
         logger.error(error_msg)
         return {"status": "failed", "error": error_msg}
 
-def download_from_azure_blob(filename: str, download_path: str) -> Dict[str, Any]:
+def _blob_result(blob_name: str, size_bytes: int) -> Dict[str, Any]:
+    """
+    Build the success result for a stored blob, with a fresh SAS URL.
+    Keys are in the order the tools return them, so callers can prepend "source" and pass it through.
+    """
+    blob_url = _generate_blob_url(blob_name)
+    return {
+        "blob_url": blob_url,
+        "markdown": f"![{blob_name}]({blob_url})",
+        "filename": blob_name,
+        "size_bytes": size_bytes,
+        "status": "success"
+    }
+
+async def _existing_blob_result(blob_name: str) -> Optional[Dict[str, Any]]:
+    """Return the upload result for a blob that is already stored, or None if it doesn't exist."""
+    container_client = await _get_async_container_client()
+    try:
+        properties = await container_client.get_blob_client(blob_name).get_blob_properties()
+    except ResourceNotFoundError:
+        return None
+    return _blob_result(blob_name, properties.size)
+
+def _local_file_digest(path: str) -> str:
+    """Identify a local file by its size and first 64 KiB without reading all of it."""
+    digest = hashlib.blake2b(str(os.path.getsize(path)).encode(), digest_size=8)
+    with open(path, "rb") as f:
+        digest.update(f.read(65536))
+    return digest.hexdigest()
+
+async def _upload_url_to_azure(url: str, blob_name: str, max_concurrency: int = None) -> Dict[str, Any]:
+    """Stream an image URL straight into Azure Blob Storage without buffering the whole body."""
+    async with get_http_client().stream("GET", url) as response:
+        response.raise_for_status()
+
+        # Verify it's an image before anything is uploaded: trust the leading bytes
+        # over the content-type, which many CDNs get wrong
+        # Chunks are taken as they arrive, so a mismatch aborts after the first packet
+        chunks = response.aiter_bytes()
+        first_chunk = await _read_prefix(chunks)
+        if not _sniff_image_type(first_chunk):
+            content_type = response.headers.get('content-type', '')
+            return {
+                "status": "failed",
+                "error": f"Unsupported or unrecognised image format; only JPEG, PNG, GIF and WebP are accepted (content-type: {content_type})"
+            }
+
+        # Content-Length only matches the decoded body when there is no content encoding
+        length = response.headers.get('content-length')
+        if length is not None and response.headers.get('content-encoding', 'identity') == 'identity':
+            length = int(length)
+        else:
+            length = None
+
+        return await upload_to_azure_blob(
+            data_stream=_prepend_chunk(first_chunk, chunks),
+            length=length,
+            blob_name=blob_name,
+            max_concurrency=max_concurrency
+        )
+
+async def download_from_azure_blob(filename: str, download_path: str) -> Dict[str, Any]:
     """Download a file from Azure Blob Storage."""
     try:
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
-        blob_client = blob_service_client.get_blob_client(container=CONTAINER_NAME, blob=filename)
+        container_client = await _get_async_container_client()
+        blob_client = container_client.get_blob_client(filename)
         
         # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(download_path), exist_ok=True)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(download_path), exist_ok=True)
         
+        # Ranges are fetched in parallel on the event loop; only the local writes touch disk
+        downloader = await blob_client.download_blob(max_concurrency=AZURE_MAX_CONCURRENCY)
         with open(download_path, "wb") as download_file:
-            download_file.write(blob_client.download_blob().readall())
+            await downloader.readinto(download_file)
         
         logger.info(f"Successfully downloaded {filename} to {download_path}")
         
@@ -538,6 +1023,76 @@ async def search_google_images(
         logger.error(error_msg)
         return [{"error": error_msg, "status": "failed"}]
 
+async def _save_image_source(index: int, source: str, blob_prefix: str, timestamp: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Fetch one image source and upload it to Azure; used by save_images_to_azure."""
+    async with semaphore:
+        try:
+            is_url = source.startswith(("http://", "https://"))
+            parsed = urlparse(source) if is_url else None
+            # Stat local paths off the event loop thread; it can stall on slow or network disks
+            is_local_file = not is_url and await asyncio.to_thread(os.path.exists, source)
+
+            # Block royalty-free image sources
+            if is_url and _is_royalty_free_host(parsed.hostname):
+                return {
+                    "source": source,
+                    "error": "Royalty-free image sources are not allowed.",
+                    "status": "failed"
+                }
+
+            # Generate unique blob name (the batch shares one timestamp; the index keeps names apart)
+            extension = "png"  # Default extension
+
+            # Try to get extension from source
+            if is_url:
+                if '.' in parsed.path:
+                    extension = parsed.path.rsplit('.', 1)[-1].lower()
+                    if extension not in _ALLOWED_EXTENSIONS:
+                        extension = "png"
+            elif is_local_file:
+                _, ext = os.path.splitext(source)
+                if ext:
+                    extension = ext[1:].lower()
+
+            blob_name = f"{blob_prefix}_{index+1:03d}_{timestamp}.{extension}"
+
+            # Fetch and upload the image
+            if is_url:
+                # Handle URL: stream the body straight into the blob upload
+                upload_result = await _upload_url_to_azure(source, blob_name)
+
+            elif is_local_file:
+                # Handle local file
+                upload_result = await upload_to_azure_blob(
+                    local_file_path=source,
+                    blob_name=blob_name
+                )
+            else:
+                return {
+                    "source": source,
+                    "error": "File not found and not a valid URL",
+                    "status": "failed"
+                }
+
+            # Process upload result
+            if upload_result["status"] == "success":
+                logger.info(f"Successfully uploaded {source} to Azure as {blob_name}")
+                return {"source": source, **upload_result}
+            return {
+                "source": source,
+                "error": upload_result["error"],
+                "status": "failed"
+            }
+
+        except Exception as e:
+            error_msg = f"Error processing {source}: {str(e)}"
+            logger.error(error_msg)
+            return {
+                "source": source,
+                "error": error_msg,
+                "status": "failed"
+            }
+
 @mcp.tool()
 async def save_images_to_azure(
     image_sources: List[str],
@@ -563,100 +1118,13 @@ async def save_images_to_azure(
         if not image_sources:
             return [{"error": "No image sources provided", "status": "failed"}]
         
-        results = []
-        
-        for i, source in enumerate(image_sources):
-            try:
-                # Block royalty-free image sources
-                if source.startswith(("http://", "https://")) and is_royalty_free_url(source):
-                    results.append({
-                        "source": source,
-                        "error": "Royalty-free image sources are not allowed.",
-                        "status": "failed"
-                    })
-                    continue
-
-                # Generate unique blob name
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                extension = "png"  # Default extension
-
-                # Try to get extension from source
-                if source.startswith(("http://", "https://")):
-                    parsed = urlparse(source)
-                    if '.' in parsed.path:
-                        extension = parsed.path.split('.')[-1].lower()
-                        if extension not in ['png', 'jpg', 'jpeg', 'gif', 'webp']:
-                            extension = "png"
-                elif os.path.exists(source):
-                    _, ext = os.path.splitext(source)
-                    if ext:
-                        extension = ext[1:].lower()
-
-                blob_name = f"{blob_prefix}_{i+1:03d}_{timestamp}.{extension}"
-
-                # Fetch and upload the image
-                if source.startswith(("http://", "https://")):
-                    # Handle URL
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get(source)
-                        response.raise_for_status()
-
-                        # Verify it's an image
-                        content_type = response.headers.get('content-type', '')
-                        if not content_type.startswith('image/'):
-                            results.append({
-                                "source": source,
-                                "error": f"Not an image (got {content_type})",
-                                "status": "failed"
-                            })
-                            continue
-
-                        # Upload to Azure
-                        upload_result = upload_to_azure_blob(
-                            file_data=response.content,
-                            blob_name=blob_name
-                        )
-
-                elif os.path.exists(source):
-                    # Handle local file
-                    upload_result = upload_to_azure_blob(
-                        local_file_path=source,
-                        blob_name=blob_name
-                    )
-                else:
-                    results.append({
-                        "source": source,
-                        "error": "File not found and not a valid URL",
-                        "status": "failed"
-                    })
-                    continue
-
-                # Process upload result
-                if upload_result["status"] == "success":
-                    results.append({
-                        "source": source,
-                        "blob_url": upload_result["blob_url"],
-                        "markdown": upload_result["markdown"],
-                        "filename": upload_result["filename"],
-                        "size_bytes": upload_result["size_bytes"],
-                        "status": "success"
-                    })
-                    logger.info(f"Successfully uploaded {source} to Azure as {blob_name}")
-                else:
-                    results.append({
-                        "source": source,
-                        "error": upload_result["error"],
-                        "status": "failed"
-                    })
-
-            except Exception as e:
-                error_msg = f"Error processing {source}: {str(e)}"
-                logger.error(error_msg)
-                results.append({
-                    "source": source,
-                    "error": error_msg,
-                    "status": "failed"
-                })
+        # Fetch and upload all sources concurrently; results keep the input order
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_SAVES)
+        results = await asyncio.gather(*(
+            _save_image_source(i, source, blob_prefix, timestamp, semaphore)
+            for i, source in enumerate(image_sources)
+        ))
         
         # Log summary
         success_count = sum(1 for r in results if r["status"] == "success")
@@ -673,6 +1141,7 @@ async def save_images_to_azure(
 async def upload_single_image_to_azure(
     image_source: str,
     blob_name: str = None,
+    max_concurrency: int = None,
     ctx: Context = None
 ) -> Dict[str, Any]:
     """
@@ -682,79 +1151,84 @@ async def upload_single_image_to_azure(
     
     Args:
         image_source: Image URL or local file path to upload
-        blob_name: Custom name for the blob (optional, auto-generated if not provided)
+        blob_name: Custom name for the blob (optional; derived from the source if not provided,
+            in which case re-uploading the same source returns the stored blob)
+        max_concurrency: Parallel block uploads for images over 8 MiB (optional, default 8, max: 16)
         
     Returns:
         Dictionary with upload result:
         - {"source": str, "blob_url": str, "markdown": str, "filename": str, "status": "success"}
         - {"source": str, "error": str, "status": "failed"}
     """
+    # Limit caller-supplied block parallelism
+    if max_concurrency is not None:
+        max_concurrency = min(max(1, max_concurrency), 16)
+    return await _upload_single_image(image_source, blob_name, max_concurrency)
+
+async def _upload_single_image(
+    image_source: str,
+    blob_name: str = None,
+    max_concurrency: int = None
+) -> Dict[str, Any]:
+    """Upload one image source to Azure; shared by the single and batch upload tools."""
     try:
+        is_url = image_source.startswith(("http://", "https://"))
+        parsed = urlparse(image_source) if is_url else None
+
         # Block royalty-free image sources
-        if image_source.startswith(("http://", "https://")) and is_royalty_free_url(image_source):
+        if is_url and _is_royalty_free_host(parsed.hostname):
             return {
                 "source": image_source,
                 "error": "Royalty-free image sources are not allowed.",
                 "status": "failed"
             }
 
-        # Auto-generate blob name if not provided
-        if blob_name is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if not is_url and not await asyncio.to_thread(os.path.exists, image_source):
+            return {
+                "source": image_source,
+                "error": "File not found",
+                "status": "failed"
+            }
 
-            if image_source.startswith(("http://", "https://")):
+        # Auto-generate a deterministic blob name if not provided, so uploading
+        # the same image again finds the existing blob instead of re-transferring it
+        upload_result = None
+        if blob_name is None:
+            if is_url:
                 # Extract filename from URL
-                parsed = urlparse(image_source)
                 filename = os.path.basename(parsed.path) or "image"
                 name_part = os.path.splitext(filename)[0]
                 extension = "png"
                 if '.' in filename:
-                    extension = filename.split('.')[-1].lower()
-                    if extension not in ['png', 'jpg', 'jpeg', 'gif', 'webp']:
+                    extension = filename.rsplit('.', 1)[-1].lower()
+                    if extension not in _ALLOWED_EXTENSIONS:
                         extension = "png"
-                blob_name = f"{name_part}_{timestamp}.{extension}"
+                digest = hashlib.blake2b(image_source.encode(), digest_size=8).hexdigest()
             else:
                 # Use local filename
                 filename = os.path.basename(image_source)
                 name_part = os.path.splitext(filename)[0] or "image"
                 extension = os.path.splitext(filename)[1][1:].lower() or "png"
-                blob_name = f"{name_part}_{timestamp}.{extension}"
+                digest = await asyncio.to_thread(_local_file_digest, image_source)
+            blob_name = f"{name_part}_{digest}.{extension}"
 
-        # Upload the image
-        if image_source.startswith(("http://", "https://")):
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_source)
-                response.raise_for_status()
-
-                # Verify it's an image
-                content_type = response.headers.get('content-type', '')
-                if not content_type.startswith('image/'):
-                    return {
-                        "source": image_source,
-                        "error": f"Not an image (got {content_type})",
-                        "status": "failed"
-                    }
-
-                upload_result = upload_to_azure_blob(file_data=response.content, blob_name=blob_name)
-        else:
-            if not os.path.exists(image_source):
-                return {
-                    "source": image_source,
-                    "error": "File not found",
-                    "status": "failed"
-                }
+            upload_result = await _existing_blob_result(blob_name)
+            if upload_result is not None:
+                logger.info(f"{image_source} is already stored as {blob_name}, skipping upload")
 
-            upload_result = upload_to_azure_blob(local_file_path=image_source, blob_name=blob_name)
+        # Upload the image
+        if upload_result is None and is_url:
+            # Stream the body straight into the blob upload; the first chunk is sniffed first
+            upload_result = await _upload_url_to_azure(image_source, blob_name, max_concurrency=max_concurrency)
+        elif upload_result is None:
+            upload_result = await upload_to_azure_blob(
+                local_file_path=image_source,
+                blob_name=blob_name,
+                max_concurrency=max_concurrency
+            )
 
         if upload_result["status"] == "success":
-            return {
-                "source": image_source,
-                "blob_url": upload_result["blob_url"],
-                "markdown": upload_result["markdown"],
-                "filename": upload_result["filename"],
-                "size_bytes": upload_result["size_bytes"],
-                "status": "success"
-            }
+            return {"source": image_source, **upload_result}
         else:
             return {
                 "source": image_source,
@@ -771,6 +1245,47 @@ async def upload_single_image_to_azure(
             "status": "failed"
         }
 
+@mcp.tool()
+async def upload_images_to_azure(
+    image_sources: List[str],
+    max_in_flight: int = MAX_PARALLEL_SAVES,
+    max_concurrency: int = None,
+    ctx: Context = None
+) -> List[Dict[str, Any]]:
+    """
+    Upload several images to Azure Blob Storage in one call.
+    Blob names are generated as in upload_single_image_to_azure.
+    
+    Args:
+        image_sources: A list of image URLs or local file paths
+        max_in_flight: How many images are fetched and uploaded at once (default: 8, max: 16)
+        max_concurrency: Parallel block uploads for images over 8 MiB (optional, default 8, max: 16)
+        
+    Returns:
+        A list of upload results in the same order as image_sources, each shaped like
+        the result of upload_single_image_to_azure
+    """
+    if not image_sources:
+        return [{"error": "No image sources provided", "status": "failed"}]
+    
+    # Limit caller-supplied parallelism: each in-flight upload can open
+    # max_concurrency block PUTs on top of the shared HTTP pool
+    max_in_flight = min(max(1, max_in_flight), 16)
+    if max_concurrency is not None:
+        max_concurrency = min(max(1, max_concurrency), 16)
+    semaphore = asyncio.Semaphore(max_in_flight)
+    
+    async def upload_one(image_source: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await _upload_single_image(image_source, max_concurrency=max_concurrency)
+    
+    results = await asyncio.gather(*(upload_one(source) for source in image_sources))
+    
+    success_count = sum(1 for r in results if r["status"] == "success")
+    logger.info(f"Uploaded {len(image_sources)} images: {success_count} successful, {len(results) - success_count} failed")
+    
+    return results
+
 @mcp.tool()
 async def download_image_from_azure(
     filename: str,
@@ -790,7 +1305,7 @@ async def download_image_from_azure(
         - {"filename": str, "error": str, "status": "failed"}
     """
     try:
-        result = download_from_azure_blob(filename, download_path)
+        result = await download_from_azure_blob(filename, download_path)
         
         if result["status"] == "success":
             logger.info(f"Downloaded {filename} from Azure Blob Storage to {download_path}")
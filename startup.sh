@@ -46,4 +46,4 @@ if command -v google-chrome &> /dev/null; then
 fi
 
 # Start the FastAPI application with Uvicorn (not Gunicorn)
-exec python -m uvicorn app:app --host 0.0.0.0 --port $PORT --workers 1
\ No newline at end of file
+exec python -m uvicorn app:app --host 0.0.0.0 --port $PORT --workers ${WEB_CONCURRENCY:-1} --loop uvloop --http httptools --timeout-keep-alive ${KEEP_ALIVE_TIMEOUT:-75}
\ No newline at end of file
@@ -1,27 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import sseclient
 import sys
 
 BASE_URL = "https://image-mcp-server-fhf0bzdxdnced7fj.australiaeast-01.azurewebsites.net"
 
-def check_root():
+# One session for every check so they share pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+def check_root(r=None):
     url = f"{BASE_URL}/"
     print(f"\n[1] Checking {url}")
-    r = requests.get(url)
+    if r is None:
+        r = SESSION.get(url)
     print("Status:", r.status_code)
     print("Body:", r.text[:200])
 
-def check_health():
+def check_health(r=None):
     url = f"{BASE_URL}/health"
     print(f"\n[2] Checking {url}")
-    r = requests.get(url)
+    if r is None:
+        r = SESSION.get(url)
     print("Status:", r.status_code)
     print("Body:", r.text.strip())
 
-def check_manifest():
+def check_manifest(r=None):
     url = f"{BASE_URL}/mcp/manifest.json"
     print(f"\n[3] Checking {url}")
-    r = requests.get(url)
+    if r is None:
+        r = SESSION.get(url)
     print("Status:", r.status_code)
     body = r.text.strip()
     print("Body:", body[:300])  # print first 300 chars only
@@ -42,6 +51,11 @@ def check_manifest():
             print("❌ Manifest is not valid JSON:", e)
     return None
 
+def prefetch(paths):
+    """GET independent endpoints concurrently; the checks then report on them in order."""
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        return list(executor.map(lambda path: SESSION.get(f"{BASE_URL}{path}"), paths))
+
 def check_sse(manifest):
     if not manifest or "endpoints" not in manifest or "sse" not in manifest["endpoints"]:
         print("\n[4] Skipping SSE check (manifest invalid)")
@@ -50,7 +64,7 @@ def check_sse(manifest):
     print(f"\n[4] Testing SSE connection to {url}")
     try:
         # Open streaming request
-        r = requests.get(url, stream=True, timeout=10)
+        r = SESSION.get(url, stream=True, timeout=10)
         if r.status_code != 200:
             print(f"❌ SSE connection failed with status {r.status_code}")
             return
@@ -62,7 +76,8 @@ def check_sse(manifest):
         print("❌ SSE connection failed:", e)
 
 if __name__ == "__main__":
-    check_root()
-    check_health()
-    manifest = check_manifest()
+    root, health, manifest_response = prefetch(["/", "/health", "/mcp/manifest.json"])
+    check_root(root)
+    check_health(health)
+    manifest = check_manifest(manifest_response)
     check_sse(manifest)